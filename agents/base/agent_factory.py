@@ -1,8 +1,18 @@
-from langgraph.prebuilt import create_react_agent
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
 import logging
 from utils.log import Logger
+from utils.history import trim_history
 logger = Logger(name="base_agent", log_file="Logs/app.log", level=logging.DEBUG)
+
+# Appended to every agent prompt: tool calls from one response run concurrently,
+# so independent Magento lookups cost one round trip instead of one each.
+PARALLEL_TOOLS_HINT = (
+    "\n\nWhen several tool calls do not depend on each other's results "
+    "(e.g. looking up different SKUs, orders or customers), request them together "
+    "in a single response instead of one per turn."
+)
+
 def build_agent(
     llm: Any,
     tools: List[Any],
@@ -12,10 +22,30 @@ def build_agent(
 ) -> Any:
     #logger.info(f"agent name:{name}")
     #logger.info(f"agent name:{prompt}")
+    # Imported here so processes that never build an agent skip langgraph.prebuilt at import.
+    from langgraph.prebuilt import create_react_agent
     all_tools = tools + (extra_tools or [])
     return create_react_agent(
         llm,
         tools=all_tools,
         name=name,
-        prompt=prompt
+        prompt=prompt + PARALLEL_TOOLS_HINT,
+        pre_model_hook=trim_history
     )
+
+
+def cache_per_llm(get_agent: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Memoize an agent factory per llm instance so tools, prompts and the react graph are built once."""
+    # Keyed by id(llm); the llm is kept with the agent so a recycled id() never matches.
+    cache: Dict[int, Tuple[Any, Any]] = {}
+
+    @functools.wraps(get_agent)
+    def wrapper(llm):
+        cached = cache.get(id(llm))
+        if cached is not None and cached[0] is llm:
+            return cached[1]
+        agent = get_agent(llm)
+        cache[id(llm)] = (llm, agent)
+        return agent
+
+    return wrapper
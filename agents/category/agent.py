@@ -1,12 +1,14 @@
-from agents.base.agent_factory import build_agent
+from agents.base.agent_factory import build_agent, cache_per_llm
 from utils.prompts import load_prompt
-import os
+from pathlib import Path
 
+PROMPT_PATH = Path(__file__).parent / "prompt.md"
+
+@cache_per_llm
 def get_category_agent(llm):
     from .tools import category_tools, get_category_seo_by_name_tool
     seo_update_tool = get_category_seo_by_name_tool(llm)
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompt.md")
-    prompt_text = load_prompt(prompt_path)
+    prompt_text = load_prompt(PROMPT_PATH)
 
     return build_agent(
         llm=llm,
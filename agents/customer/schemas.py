@@ -4,6 +4,9 @@ from typing import List, Optional, Literal
 class ViewCustomerInput(BaseModel):
     email: EmailStr
 
+class ViewCustomersInput(BaseModel):
+    emails: List[EmailStr] = Field(..., description="Customer emails to look up in a single request.")
+
 class AddressInput(BaseModel):
     firstname: str
     lastname: str
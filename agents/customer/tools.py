@@ -1,14 +1,26 @@
 import logging
 from langchain_core.tools import tool
-from .schemas import ViewCustomerInput,CreateCustomerInput,AddressInput,ListOrdersByCustomerIdInput
+from .schemas import ViewCustomerInput,ViewCustomersInput,CreateCustomerInput,AddressInput,ListOrdersByCustomerIdInput
 from magento.client import get_magento_client
-from typing import  Optional
+from typing import  List, Optional
+from urllib.parse import quote_plus
 from utils.log import Logger
 
 logger=Logger(name="customer_tools", log_file="Logs/app.log", level=logging.DEBUG)
 
 magento_client=get_magento_client()
 
+_CUSTOMER_BY_EMAIL = (
+    "customers/search?searchCriteria[filterGroups][0][filters][0][field]=email&"
+    "searchCriteria[filterGroups][0][filters][0][value]={email}"
+)
+_CUSTOMERS_BY_EMAILS = _CUSTOMER_BY_EMAIL + "&searchCriteria[filterGroups][0][filters][0][condition_type]=in"
+_ORDERS_BY_CUSTOMER_ID = (
+    "orders?searchCriteria[filterGroups][0][filters][0][field]=customer_id&"
+    "searchCriteria[filterGroups][0][filters][0][value]={customer_id}&"
+    "searchCriteria[filterGroups][0][filters][0][condition_type]=eq"
+)
+
 @tool(args_schema=ViewCustomerInput)
 def get_customer_info(email: str):
     """Retrieve detailed information about a specific customer by email.
@@ -22,7 +34,7 @@ def get_customer_info(email: str):
     """
     logger.info("get_customer_info tool invoked")
     try:
-        endpoint = f'customers/search?searchCriteria[filterGroups][0][filters][0][field]=email&searchCriteria[filterGroups][0][filters][0][value]={email}'
+        endpoint = _CUSTOMER_BY_EMAIL.format(email=quote_plus(email))
         data = magento_client.send_request(endpoint=endpoint, method="GET")
         customers = data.get("items", [])
         
@@ -31,27 +43,8 @@ def get_customer_info(email: str):
 
         customer = customers[0]  # Email is unique, so we expect one result
 
-        first_name = customer.get("firstname")
-        last_name = customer.get("lastname")
-        customer_id = customer.get("id")
-        addresses = customer.get("addresses", [])
-
-        billing_address = None
-        shipping_address = None
-
-        for address in addresses:
-            if address.get("default_billing"):
-                billing_address = address
-            if address.get("default_shipping"):
-                shipping_address = address
-
         return {
-            "email": email,
-            "firstname": first_name,
-            "lastname": last_name,
-            "customer_id": customer_id,
-            "billing_address": billing_address,
-            "shipping_address": shipping_address,
+            **_customer_summary(customer, email),
             "status": "success",
             "done": True
         }
@@ -60,6 +53,54 @@ def get_customer_info(email: str):
         return {"error": f"Failed to retrieve customer with email '{email}': {str(e)}", "done": True}
 
 
+@tool(args_schema=ViewCustomersInput)
+def get_customers_info(emails: List[str]):
+    """Retrieve several customers by email in a single Magento request.
+    Prefer this over calling get_customer_info repeatedly when more than one customer is needed.
+
+    Args:
+        emails: Customer emails
+
+    Returns:
+        A mapping of email to customer details (same fields as get_customer_info), or to an error if not found.
+    """
+    logger.info("get_customers_info tool invoked")
+    try:
+        endpoint = _CUSTOMERS_BY_EMAILS.format(email=quote_plus(",".join(emails)))
+        data = magento_client.send_request(endpoint=endpoint, method="GET")
+        found = {customer.get("email", "").lower(): customer for customer in data.get("items", [])}
+
+        customers = {}
+        for email in emails:
+            customer = found.get(email.lower())
+            customers[email] = _customer_summary(customer, email) if customer else {"error": "No customer found with this email"}
+
+        return {"customers": customers, "status": "success", "done": True}
+
+    except Exception as e:
+        return {"error": f"Failed to retrieve customers: {str(e)}", "done": True}
+
+
+def _customer_summary(customer: dict, email: str) -> dict:
+    billing_address = None
+    shipping_address = None
+
+    for address in customer.get("addresses", []):
+        if address.get("default_billing"):
+            billing_address = address
+        if address.get("default_shipping"):
+            shipping_address = address
+
+    return {
+        "email": email,
+        "firstname": customer.get("firstname"),
+        "lastname": customer.get("lastname"),
+        "customer_id": customer.get("id"),
+        "billing_address": billing_address,
+        "shipping_address": shipping_address,
+    }
+
+
 @tool(args_schema=CreateCustomerInput)
 def create_customer(
     email: str,
@@ -91,7 +132,7 @@ def create_customer(
         payload["password"] = password
 
     if address:
-        payload["customer"]["addresses"] = [address.dict(exclude_none=True)]
+        payload["customer"]["addresses"] = [address.model_dump(exclude_none=True)]
 
     try:
         response = magento_client.send_request(
@@ -125,11 +166,7 @@ def list_orders_by_customer_id(customer_id: int):
     """
     logger.info(f"list_orders_by_customer_id tool invoked for customer_id={customer_id}")
     try:
-        endpoint = (
-            f'orders?searchCriteria[filterGroups][0][filters][0][field]=customer_id&'
-            f'searchCriteria[filterGroups][0][filters][0][value]={customer_id}&'
-            f'searchCriteria[filterGroups][0][filters][0][condition_type]=eq'
-        )
+        endpoint = _ORDERS_BY_CUSTOMER_ID.format(customer_id=customer_id)
         response = magento_client.send_request(endpoint=endpoint, method="GET")
         orders = response.get("items", [])
 
@@ -156,4 +193,4 @@ def list_orders_by_customer_id(customer_id: int):
     except Exception as e:
         return {"error": f"Failed to retrieve orders: {str(e)}", "done": True}
         
-customer_tools=[get_customer_info,create_customer,list_orders_by_customer_id]        
\ No newline at end of file
+customer_tools=[get_customer_info,get_customers_info,create_customer,list_orders_by_customer_id]        
\ No newline at end of file
@@ -1,5 +1,9 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Literal
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, List, Optional, Literal
+
+# Plain syntactic check, run by pydantic-core; Magento does the authoritative validation.
+_EMAIL_PATTERN = r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$"
+Email = Annotated[str, StringConstraints(pattern=_EMAIL_PATTERN, max_length=254)]
 
 class OrderItem(BaseModel):
     sku: str
@@ -20,7 +24,7 @@ class Address(BaseModel):
 
 class CreateOrderInput(BaseModel):
     customer_id: int
-    customer_email:EmailStr
+    customer_email: Email
     firstname: str
     lastname: str
     items: List[OrderItem]
@@ -5,8 +5,10 @@ from datetime import datetime, timedelta
 from langchain_core.tools import tool
 from .schemas import CreateOrderInput,OrderItem,GetOrderByIncrementIdInput,GetOrderIdInput,CancelOrderInput,GetOrdersInput
 from magento.client import get_magento_client
+from magento.query import SearchCriteria
 from utils.log import Logger
 from magento_tools.human import add_human_in_the_loop
+from magento_tools.product_cache import invalidate_product
 logger=Logger(name="order_tools", log_file="Logs/app.log", level=logging.DEBUG)
 
 magento_client=get_magento_client()
@@ -54,10 +56,11 @@ def create_order_for_customer(
        
 
         # Step 5: Set shipping info (including address and shipping method)
+        billing = billing_address.model_dump()
         shipping_info_payload = {
             "addressInformation": {
-                "shipping_address": shipping_address.dict(),
-                "billing_address": billing_address.dict(),
+                "shipping_address": shipping_address.model_dump(),
+                "billing_address": billing,
                 "shipping_method_code": "flatrate",
                 "shipping_carrier_code": "flatrate"
             }
@@ -73,7 +76,7 @@ def create_order_for_customer(
             "method": {
                 "method": payment_method
             },
-            "billing_address": billing_address.dict(),
+            "billing_address": billing,
             "email": customer_email
         }
         magento_client.send_request(
@@ -85,6 +88,9 @@ def create_order_for_customer(
     endpoint=f"carts/{cart_id}/order",
     method="PUT"
 )
+        # Placing the order changes stock for every ordered SKU.
+        for item in items:
+            invalidate_product(item.sku)
         order_increment_id = order_response
         logger.info(f"order_increment_id:{order_increment_id}")
         return {                       
@@ -176,6 +182,8 @@ def create_order_for_guest(
             method="POST",
             data=payment_payload
         )
+        for item in items:
+            invalidate_product(item.sku)
 
         order_increment_id = order_response
         logger.info(f"Guest order_increment_id: {order_increment_id}")
@@ -197,12 +205,7 @@ def get_order_info_by_increment_id(increment_id: str) -> dict:
     """
     logger.info(f"get_order_info_by_increment_id invoked with increment_id={increment_id}")
     try:
-        query_string = (
-            "searchCriteria[filterGroups][0][filters][0][field]=increment_id&"
-            f"searchCriteria[filterGroups][0][filters][0][value]={increment_id}&"
-            "searchCriteria[filterGroups][0][filters][0][conditionType]=eq"
-        )
-        endpoint = f"orders?{query_string}"
+        endpoint = SearchCriteria().where("increment_id", increment_id).endpoint("orders")
         response = magento_client.send_request(endpoint, method="GET")
 
         orders = response.get("items", [])
@@ -262,12 +265,7 @@ def get_order_id_by_increment(increment_id: str) -> dict:
 
     logger.info("get_order_id_by_increment tool invoked")
     try:
-        query_string = (
-            "searchCriteria[filterGroups][0][filters][0][field]=increment_id&"
-            f"searchCriteria[filterGroups][0][filters][0][value]={increment_id}&"
-            "searchCriteria[filterGroups][0][filters][0][conditionType]=eq"
-        )
-        endpoint = f"orders?{query_string}"
+        endpoint = SearchCriteria().where("increment_id", increment_id).endpoint("orders")
         response = magento_client.send_request(endpoint, method="GET")
         items = response.get("items", [])
         if not items:
@@ -307,52 +305,18 @@ def get_orders(status: Optional[str] = None,
     - last_n_days: Filter by creation date
     """
     try:
-        filters = []
-
-        filter_index = 0
+        criteria = SearchCriteria()
         if status:
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][field]=status"
-            )
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][value]={status}"
-            )
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][conditionType]=eq"
-            )
-            filter_index += 1
-
+            criteria.where("status", status)
         if payment_method:
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][field]=payment.method"
-            )
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][value]={payment_method}"
-            )
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][conditionType]=eq"
-            )
-            filter_index += 1
-
+            criteria.where("payment.method", payment_method)
         if last_n_days:
             date_str = (datetime.utcnow() - timedelta(days=last_n_days)).strftime('%Y-%m-%d %H:%M:%S')
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][field]=created_at"
-            )
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][value]={date_str}"
-            )
-            filters.append(
-                f"searchCriteria[filterGroups][{filter_index}][filters][0][conditionType]=gteq"
-            )
-            filter_index += 1
+            criteria.where("created_at", date_str, "gteq")
 
         # Pagination
-        filters.append(f"searchCriteria[pageSize]={page_size}")
-        filters.append(f"searchCriteria[currentPage]={current_page}")
-
-        query_string = "&".join(filters)
-        endpoint = f"orders?{query_string}"
+        criteria.page_size(page_size).current_page(current_page)
+        endpoint = criteria.endpoint("orders")
 
         response = magento_client.send_request(endpoint, method="GET")
         return {
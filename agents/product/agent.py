@@ -1,15 +1,17 @@
-from agents.base.agent_factory import build_agent
+from agents.base.agent_factory import build_agent, cache_per_llm
 from utils.prompts import load_prompt
-import os
+from pathlib import Path
 
+PROMPT_PATH = Path(__file__).parent / "prompt.txt"
+
+@cache_per_llm
 def get_product_agent(llm):
     from .tools import tools,enhance_product_description_tool,suggest_product_links_tool
     enhance_product_description = enhance_product_description_tool(llm)
     suggest_related_products = suggest_product_links_tool(llm,relation_type="related")
     suggest_upsell_products = suggest_product_links_tool(llm, relation_type="upsell")
     suggest_crosssell_products = suggest_product_links_tool(llm, relation_type="crosssell")    
-    prompt_path = os.path.join(os.path.dirname(__file__), "prompt.txt")
-    prompt_text = load_prompt(prompt_path)
+    prompt_text = load_prompt(PROMPT_PATH)
 
     return build_agent(
         llm=llm,
@@ -1,32 +1,58 @@
-from pydantic import BaseModel, Field,validator
+from enum import IntEnum, StrEnum
+from pydantic import BaseModel, ConfigDict, Field,validator
 from typing import List, Optional, Literal
+
+class ProductStatus(IntEnum):
+    ENABLED = 1
+    DISABLED = 2
+
+class ProductVisibility(IntEnum):
+    NOT_VISIBLE = 1
+    CATALOG = 2
+    SEARCH = 3
+    CATALOG_SEARCH = 4
+
+class ProductType(StrEnum):
+    SIMPLE = "simple"
+    VIRTUAL = "virtual"
+    CONFIGURABLE = "configurable"
+    BUNDLE = "bundle"
+    GROUPED = "grouped"
+    DOWNLOADABLE = "downloadable"
    
 class MagentoAPIBase(BaseModel):
+    # Only fields the view tools accept; the REST API version stays the client's default.
     store_view_code: Optional[str] = "default"
-    api_version: Optional[str] = "v1"
 
 
 class ViewProductInput(MagentoAPIBase):
     sku: str 
 
+class ViewProductsBulkInput(MagentoAPIBase):
+    skus: List[str] = Field(..., description="SKUs to look up in as few requests as possible.")
+
 class CreateProductInput(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     sku: str
     name: str
     price: float
-    status: int  # 1 = Enabled, 2 = Disabled
-    type_id: str = "simple"
+    status: ProductStatus
+    type_id: ProductType = ProductType.SIMPLE
     attribute_set_id: int = 4  # Default attribute set
     weight: Optional[float] = 1.0
-    visibility: int = 4  # 4 = Catalog, Search
+    visibility: ProductVisibility = ProductVisibility.CATALOG_SEARCH
     qty: Optional[float] = 0
     is_in_stock: Optional[bool] = True
 
 class UpdateProductInput(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
     sku: str
     name: Optional[str] = None
     price: Optional[float] = None
-    status: Optional[int] = None  # 1 = Enabled, 2 = Disabled
-    visibility: Optional[int] = None  # 1 = Not visible, 2 = Catalog, 3 = Search, 4 = Catalog/Search
+    status: Optional[ProductStatus] = None
+    visibility: Optional[ProductVisibility] = None
     weight: Optional[float] = None
     qty: Optional[float] = None
     is_in_stock: Optional[bool] = None
@@ -59,4 +85,23 @@ class LinkedProductsInput(BaseModel):
    
 
 class LinkedProductsOutput(BaseModel):
-    linked_skus: list[str] = Field(..., description="List of SKUs to link to the given SKU.")
\ No newline at end of file
+    linked_skus: list[str] = Field(..., description="List of SKUs to link to the given SKU.")
+
+class StockItemResponse(BaseModel):
+    qty: Optional[float] = 0
+    is_in_stock: bool = False
+
+class ProductExtensionAttributes(BaseModel):
+    stock_item: StockItemResponse = StockItemResponse()
+
+class ProductResponse(BaseModel):
+    """Subset of Magento's product payload used by the product tools; other fields are ignored."""
+    sku: str
+    name: Optional[str] = None
+    price: Optional[float] = 0.0
+    type_id: Optional[str] = None
+    extension_attributes: ProductExtensionAttributes = ProductExtensionAttributes()
+
+class ProductSearchResponse(BaseModel):
+    items: List[ProductResponse] = []
+
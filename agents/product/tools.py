@@ -1,108 +1,179 @@
-import os
+import math
+import asyncio
 import logging
-from typing import  Optional,Dict
-from langchain_core.tools import tool
-from langchain.tools import Tool
-from langchain_core.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+from collections import Counter, defaultdict
+from heapq import nlargest
+from operator import itemgetter
+from typing import  Optional,Dict,List,Tuple
+from functools import lru_cache
+from langchain_core.tools import tool, Tool
 from datetime import datetime, timedelta,timezone
-import urllib.parse
-from .schemas import LinkedProductsOutput,LinkedProductsInput,ProductDescription,TopSellingProductsInput,CreateProductInput,ViewProductInput,SearchProductsInput,UpdateProductInput,DeleteProductInput
+from urllib.parse import quote
+from .schemas import LinkedProductsOutput,LinkedProductsInput,ProductDescription,TopSellingProductsInput,CreateProductInput,ViewProductInput,SearchProductsInput,UpdateProductInput,DeleteProductInput,ProductResponse,ProductSearchResponse,ViewProductsBulkInput
 from magento.client import get_magento_client
+from magento.query import SearchCriteria
 from utils.log import Logger
 from magento_tools.human import add_human_in_the_loop
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
-from langgraph.prebuilt.interrupt import HumanInterrupt
-from langgraph.types import interrupt
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import PromptTemplate
+from magento_tools.product_cache import get_product, put_product, invalidate_product, generation as cache_generation
 
 logger=Logger(name="product_tools", log_file="Logs/app.log", level=logging.DEBUG)
 
 magento_client=get_magento_client()
 
-def error_response(action: str, error: Exception) -> Dict:
-    return {"error": f"Failed to {action}: {str(error)}"}
+# search_products sort_by -> (Magento field, direction); anything else sorts by relevance.
+_SORT_MAP = {
+    "price_asc": ("price", "ASC"),
+    "price_desc": ("price", "DESC"),
+    "newest": ("created_at", "DESC")
+}
+_DEFAULT_SORT = ("relevance", "DESC")
+
+# Concurrent Magento searches per bulk/child product lookup.
+_FETCH_CONCURRENCY = 10
+
+# Orders created on/after a date; only the date and page vary per top_selling_products request.
+# Sorted by entity_id so concurrently fetched pages neither overlap nor skip orders, and trimmed
+# with `fields` to the item columns the ranking reads.
+_ORDERS_PAGE_SIZE = 200
+_ORDERS_MAX_PAGES = 25
+_ORDERS_CREATED_SINCE = (
+    "orders?searchCriteria[filterGroups][0][filters][0][field]=created_at&"
+    "searchCriteria[filterGroups][0][filters][0][value]={from_date}&"
+    "searchCriteria[filterGroups][0][filters][0][condition_type]=gteq&"
+    "searchCriteria[sortOrders][0][field]=entity_id&"
+    "searchCriteria[sortOrders][0][direction]=ASC&"
+    f"searchCriteria[pageSize]={_ORDERS_PAGE_SIZE}&"
+    "searchCriteria[currentPage]={page}&"
+    "fields=items[items[sku,qty_ordered,price]],total_count"
+)
+
+# SKUs per `in` filter in view_products_bulk, keeping request URLs well under server limits.
+_BULK_CHUNK_SIZE = 50
+
+# update_product fields that Magento expects under extension_attributes.stock_item
+_STOCK_ITEM_FIELDS = ("qty", "is_in_stock")
+
+_ERROR_TEMPLATE = "Failed to {action}{scope}: {message}"
+
+def error_response(action: str, error: Exception, sku: Optional[str] = None) -> Dict:
+    """Build a tool error payload and log the active exception; call from an except block."""
+    scope = f" with SKU '{sku}'" if sku else ""
+    message = _ERROR_TEMPLATE.format_map({"action": action, "scope": scope, "message": error})
+    logger.exception(message)
+    return {"error": message}
+
+async def _fetch_product(sku: str, store_view_code: Optional[str] = None) -> ProductResponse:
+    store_key = store_view_code or magento_client.DEFAULT_STORE_VIEW_CODE
+    product = get_product(sku, store_key)
+    if product is not None:
+        return product
+
+    fetched_at = cache_generation()
+    raw = await magento_client.asend_request(
+        endpoint=f"products/{sku}", method="GET", raw=True, store_view_code=store_view_code
+    )
+    product = ProductResponse.model_validate_json(raw)
+    put_product(sku, store_key, product, fetched_at)
+    return product
+
+
+def _product_summary(product: ProductResponse) -> dict:
+    stock_item = product.extension_attributes.stock_item
+    return {
+        "sku": product.sku,
+        "name": product.name,
+        "price": float(product.price or 0.0),
+        "stock": stock_item.qty or 0,
+        "status": "available" if stock_item.is_in_stock else "out_of_stock"
+    }
+
+
+async def _fetch_products(
+    skus: List[str], store_view_code: Optional[str] = None
+) -> Tuple[Dict[str, ProductResponse], Dict[str, str]]:
+    """Return ``(found, failed)``: products keyed by lower-cased SKU, and an error message for
+    each SKU whose search request failed. Cached SKUs are answered locally; the rest are
+    fetched with one `sku in (...)` search per _BULK_CHUNK_SIZE SKUs, and a failed search
+    only affects the SKUs in its own chunk."""
+    store_key = store_view_code or magento_client.DEFAULT_STORE_VIEW_CODE
+    found: Dict[str, ProductResponse] = {}
+    missing = []
+    for sku in dict.fromkeys(skus):
+        product = get_product(sku, store_key)
+        if product is not None:
+            found[sku.lower()] = product
+        else:
+            missing.append(sku)
+
+    semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+    fetched_at = cache_generation()
+
+    async def fetch_chunk(chunk: List[str]) -> List[ProductResponse]:
+        endpoint = SearchCriteria().where("sku", ",".join(chunk), "in").page_size(len(chunk)).endpoint("products")
+        async with semaphore:
+            raw = await magento_client.asend_request(endpoint, method="GET", raw=True, store_view_code=store_view_code)
+        return ProductSearchResponse.model_validate_json(raw).items
+
+    chunks = [missing[i:i + _BULK_CHUNK_SIZE] for i in range(0, len(missing), _BULK_CHUNK_SIZE)]
+    results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+    failed: Dict[str, str] = {}
+    for chunk, items in zip(chunks, results):
+        if isinstance(items, Exception):
+            logger.error(f"Product lookup failed for {len(chunk)} SKUs: {items}")
+            failed.update((sku, str(items)) for sku in chunk)
+            continue
+        for product in items:
+            put_product(product.sku, store_key, product, fetched_at)
+            found[product.sku.lower()] = product
+    return found, failed
+
+
+def _format_child(product: ProductResponse) -> dict:
+    return _product_summary(product)
+
 
 @tool(args_schema=ViewProductInput)
-def view_product(sku: str):
+async def view_product(sku: str, store_view_code: Optional[str] = None):
     """Retrieve detailed information about a specific product, including associated products if applicable."""
     logger.info("view_product tool invoked")
     try:
         # Step 1: Get main product
-        endpoint = f"products/{sku}"
-        product = magento_client.send_request(endpoint=endpoint, method="GET")
+        product = await _fetch_product(sku, store_view_code)
+        type_id = product.type_id
 
-        name = product.get("name")
-        price = product.get("price", 0.0)
-        stock_item = product.get("extension_attributes", {}).get("stock_item", {})
-        stock_qty = stock_item.get("qty", 0)
-        is_in_stock = stock_item.get("is_in_stock", False)
-        type_id = product.get("type_id")
-
-        result = {
-            "sku": sku,
-            "name": name,
-            "type": type_id,
-            "price": float(price),
-            "stock": stock_qty,
-            "status": "available" if is_in_stock else "out_of_stock"
-        }
+        result = {**_product_summary(product), "sku": sku, "type": type_id}
 
-        detailed_associated = []
+        child_skus = []
 
         # Configurable Products
         if type_id == "configurable":
             children_endpoint = f"configurable-products/{sku}/children"
-            children = magento_client.send_request(endpoint=children_endpoint, method="GET")
-
-            for child in children:
-                child_sku = child.get("sku")
-                child_details = magento_client.send_request(endpoint=f"products/{child_sku}", method="GET")
-                child_stock = child_details.get("extension_attributes", {}).get("stock_item", {})
-                detailed_associated.append({
-                    "sku": child_sku,
-                    "name": child_details.get("name"),
-                    "price": float(child_details.get("price", 0.0)),
-                    "stock": child_stock.get("qty", 0),
-                    "status": "available" if child_stock.get("is_in_stock", False) else "out_of_stock"
-                })
+            children = await magento_client.asend_request(endpoint=children_endpoint, method="GET")
+            child_skus = [child.get("sku") for child in children]
 
         # Grouped Products
         elif type_id == "grouped":
             links_endpoint = f"products/{sku}/links/associated"
-            links = magento_client.send_request(endpoint=links_endpoint, method="GET")
-
-            for item in links:
-                child_sku = item.get("linked_product_sku")
-                child_details = magento_client.send_request(endpoint=f"products/{child_sku}", method="GET")
-                child_stock = child_details.get("extension_attributes", {}).get("stock_item", {})
-                detailed_associated.append({
-                    "sku": child_sku,
-                    "name": child_details.get("name"),
-                    "price": float(child_details.get("price", 0.0)),
-                    "stock": child_stock.get("qty", 0),
-                    "status": "available" if child_stock.get("is_in_stock", False) else "out_of_stock"
-                })
+            links = await magento_client.asend_request(endpoint=links_endpoint, method="GET")
+            child_skus = [item.get("linked_product_sku") for item in links]
 
         # Bundle Products
         elif type_id == "bundle":
             options_endpoint = f"bundle-products/{sku}/options/all"
-            options = magento_client.send_request(endpoint=options_endpoint, method="GET")
-
-            for option in options:
-                for link in option.get("product_links", []):
-                    child_sku = link.get("sku")
-                    child_details = magento_client.send_request(endpoint=f"products/{child_sku}", method="GET")
-                    child_stock = child_details.get("extension_attributes", {}).get("stock_item", {})
-                    detailed_associated.append({
-                        "sku": child_sku,
-                        "name": child_details.get("name"),
-                        "price": float(child_details.get("price", 0.0)),
-                        "stock": child_stock.get("qty", 0),
-                        "status": "available" if child_stock.get("is_in_stock", False) else "out_of_stock"
-                    })
+            options = await magento_client.asend_request(endpoint=options_endpoint, method="GET")
+            # The same selection can appear under several bundle options; list it once.
+            child_skus = list(dict.fromkeys(
+                link.get("sku") for option in options for link in option.get("product_links", [])
+            ))
+
+        children, failed = await _fetch_products(child_skus, store_view_code)
+        detailed_associated = [
+            _format_child(children[child_sku.lower()])
+            for child_sku in child_skus
+            if child_sku and child_sku.lower() in children
+        ]
+        if failed:
+            result["failed_children"] = [{"sku": child_sku, "error": error} for child_sku, error in failed.items()]
 
         if detailed_associated:
             result["associated_products"] = detailed_associated
@@ -110,12 +181,41 @@ def view_product(sku: str):
         return result
 
     except Exception as e:
-        logger.error("Failed to retrieve product details")
-        return {"error": f"Failed to retrieve product with SKU '{sku}': {str(e)}"}  
+        return error_response("retrieve product", e, sku)
+
+
+@tool(args_schema=ViewProductsBulkInput)
+async def view_products_bulk(skus: List[str], store_view_code: Optional[str] = None):
+    """Retrieve name, price and stock for several products at once.
+    Prefer this over calling view_product repeatedly when the user asks about two or more SKUs.
+    Associated products of configurable/grouped/bundle items are not expanded; use view_product for that.
+
+    Args:
+        skus: Product SKUs
+
+    Returns:
+        A mapping of SKU to product details, or to an error if the SKU was not found.
+    """
+    logger.info("view_products_bulk tool invoked")
+    try:
+        found, failed = await _fetch_products(skus, store_view_code)
+
+        products = {}
+        for sku in skus:
+            product = found.get(sku.lower())
+            if product:
+                products[sku] = {**_product_summary(product), "type": product.type_id}
+            else:
+                products[sku] = {"error": failed.get(sku, "Product not found")}
+
+        return {"products": products}
+
+    except Exception as e:
+        return error_response("retrieve products", e)
 
 
 @tool(args_schema=SearchProductsInput)
-def search_products(
+async def search_products(
     query: str,
     category_id: Optional[int] = None,
     min_price: Optional[float] = None,
@@ -126,53 +226,32 @@ def search_products(
     """Search for products based on query, price, category and sort filters."""
     logger.info("search_products tool invoked")
     try:
-        filters = []
-        if query:
-            filters.append(f"searchCriteria[filterGroups][0][filters][0][field]=name")
-            filters.append(f"searchCriteria[filterGroups][0][filters][0][value]=%25{query}%25")
-            filters.append(f"searchCriteria[filterGroups][0][filters][0][conditionType]=like")
-
-        group = 1
-        if category_id:
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][field]=category_id")
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][value]={category_id}")
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][conditionType]=eq")
-            group += 1
-
-        if min_price is not None:
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][field]=price")
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][value]={min_price}")
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][conditionType]=gteq")
-            group += 1
-
-        if max_price is not None:
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][field]=price")
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][value]={max_price}")
-            filters.append(f"searchCriteria[filterGroups][{group}][filters][0][conditionType]=lteq")
-            group += 1
-
-        filters.append(f"searchCriteria[pageSize]={limit}")
-        sort_map = {
-            "price_asc": ("price", "ASC"),
-            "price_desc": ("price", "DESC"),
-            "newest": ("created_at", "DESC")
-        }
-        sort_field, direction = sort_map.get(sort_by, ("relevance", "DESC"))
-        filters.append(f"searchCriteria[sortOrders][0][field]={sort_field}")
-        filters.append(f"searchCriteria[sortOrders][0][direction]={direction}")
+        specs = (
+            ("name", f"%{query}%" if query else None, "like"),
+            ("category_id", category_id or None, "eq"),
+            ("price", min_price, "gteq"),
+            ("price", max_price, "lteq"),
+        )
+        criteria = SearchCriteria()
+        for field, value, condition_type in specs:
+            if value is not None:
+                criteria.where(field, value, condition_type)
 
-        endpoint = "products?" + "&".join(filters)
-        response = magento_client.send_request(endpoint, method="GET")
-        items = response.get("items", [])
+        sort_field, direction = _SORT_MAP.get(sort_by, _DEFAULT_SORT)
+        criteria.page_size(limit).sort(sort_field, direction)
 
-        return [{"sku": item["sku"], "name": item["name"], "price": item.get("price", 0.0)} for item in items]
+        endpoint = criteria.endpoint("products")
+        raw = await magento_client.asend_request(endpoint, method="GET", raw=True)
+        items = ProductSearchResponse.model_validate_json(raw).items
+
+        return [{"sku": item.sku, "name": item.name, "price": item.price or 0.0} for item in items]
 
     except Exception as e:
         return error_response("search products", e)
 
 
 @tool(args_schema=CreateProductInput)
-def create_product(
+async def create_product(
     sku: str,
     name: str,
     price: float,
@@ -224,13 +303,14 @@ def create_product(
             }
         }
     }
-        response = magento_client.send_request("products", method="POST", data=payload)
+        response = await magento_client.asend_request("products", method="POST", data=payload)
+        invalidate_product(sku)
         return {"product_id": response.get("id"), "sku": response.get("sku"),"done":True,"status":"success","message": f"Product {name} ({sku}) created successfully."}
     except Exception as e:
-        return {"error": f"Failed to create product: {str(e)}"} 
+        return error_response("create product", e, sku)
 
 @tool(args_schema=UpdateProductInput)
-def update_product(
+async def update_product(
     sku: str,
     name: Optional[str] = None,
     price: Optional[float] = None,
@@ -256,39 +336,29 @@ def update_product(
         Updated product details or error message.
     """
     logger.info("update_product tool invoked")
+    if all(value is None for value in (name, price, status, visibility, weight, qty, is_in_stock)):
+        return {"message": "No fields provided to update."}
     try:
-        product_data = {"sku": sku}  
-
-        if name is not None:
-            product_data["name"] = name
-        if price is not None:
-            product_data["price"] = price
-        if status is not None:
-            product_data["status"] = status
-        if visibility is not None:
-            product_data["visibility"] = visibility
-        if weight is not None:
-            product_data["weight"] = weight
-        if qty is not None or is_in_stock is not None:
-            product_data.setdefault("extension_attributes", {})
-            product_data["extension_attributes"]["stock_item"] = {}
-            if qty is not None:
-                product_data["extension_attributes"]["stock_item"]["qty"] = qty
-            if is_in_stock is not None:
-                product_data["extension_attributes"]["stock_item"]["is_in_stock"] = is_in_stock
-
-        if len(product_data) == 1:  # only `sku` present
-            return {"message": "No fields provided to update."}
+        # Arguments were already validated by the tool's args_schema, so build without re-validating.
+        product_data = UpdateProductInput.model_construct(
+            sku=sku, name=name, price=price, status=status, visibility=visibility,
+            weight=weight, qty=qty, is_in_stock=is_in_stock
+        ).model_dump(exclude_none=True)
+        stock_item = {field: product_data.pop(field) for field in _STOCK_ITEM_FIELDS if field in product_data}
+        if stock_item:
+            product_data["extension_attributes"] = {"stock_item": stock_item}
 
         payload = {"product": product_data}
-        logger.debug(payload)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(payload)
 
         endpoint = f"products/{sku}"
-        response = magento_client.send_request(endpoint, method="PUT", data=payload)
+        response = await magento_client.asend_request(endpoint, method="PUT", data=payload)
+        invalidate_product(sku)
 
         return {"updated_product": response}
     except Exception as e:
-        return {"error": f"Failed to update product {sku}: {str(e)}"}
+        return error_response("update product", e, sku)
 
 @tool(args_schema=DeleteProductInput)
 def delete_product(sku: str):
@@ -301,49 +371,60 @@ def delete_product(sku: str):
     try:
         endpoint = f"products/{sku}"
         magento_client.send_request(endpoint, method="DELETE")
+        invalidate_product(sku)
         return {"sku": sku, "status": "deleted", "message": f"Product with SKU '{sku}' deleted successfully."}
     except Exception as e:
-        return {"error": f"Failed to delete product {sku}: {str(e)}"}
+        return error_response("delete product", e, sku)
     
 delete_product_with_hitl = add_human_in_the_loop(delete_product) 
 
 
+def extract_custom_attribute(custom_attributes, code):
+    for attr in custom_attributes:
+        if attr.get("attribute_code") == code:
+            return attr.get("value", "")
+    return ""
+
+
+@lru_cache(maxsize=1)
+def _description_prompt_and_parser():
+    """Build the description prompt/parser on first use; the langchain prompt and parser
+    modules are only imported when the product agent is actually built."""
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain.output_parsers import PydanticOutputParser
+
+    parser = PydanticOutputParser(pydantic_object=ProductDescription)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are a product copywriting expert for an e-commerce store."),
+        ("human", (
+            "Write short_description and full description for product with SKU '{sku}'.\n"
+            "Product name: {name}\n"
+            "Existing description: {description}\n"
+            "Existing short description: {short_description}\n\n"
+            "{format_instructions}"
+        ))
+    ]).partial(format_instructions=parser.get_format_instructions())
+    return prompt, parser
+
+
 def enhance_product_description_tool(llm):
     """
     Creates a tool that enhances or generates product descriptions using an LLM.
     """
 
-    parser = PydanticOutputParser(pydantic_object=ProductDescription)
+    prompt, parser = _description_prompt_and_parser()
+    chain = prompt | llm | parser
 
-    prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are a product copywriting expert for an e-commerce store."),
-    ("human", (
-        "Write short_description and full description for product with SKU '{sku}'.\n"
-        "Product name: {name}\n"
-        "Existing description: {description}\n"
-        "Existing short description: {short_description}\n\n"
-        "{format_instructions}"
-    ))
-])
-
-    chain = prompt.partial(format_instructions=parser.get_format_instructions()) | llm | parser
-
-    def _enhance_description(sku: str) -> dict:
+    async def _enhance_description(sku: str) -> dict:
         try:
             logger.info(f"Enhancing product description for SKU: {sku}")
 
             # Step 1: Fetch existing product
-            product = magento_client.send_request(f"products/{sku}", method="GET")
+            product = await magento_client.asend_request(f"products/{sku}", method="GET")
             if not product:
                 return {"error": f"Product with SKU '{sku}' not found"}
 
             # Step 2: If descriptions exist, send to LLM to enhance
-            def extract_custom_attribute(custom_attributes, code):
-                for attr in custom_attributes:
-                    if attr.get("attribute_code") == code:
-                        return attr.get("value", "")
-                return ""
-
             custom_attrs = product.get("custom_attributes", [])
             short_desc = extract_custom_attribute(custom_attrs, "short_description")
             desc = extract_custom_attribute(custom_attrs, "description")
@@ -357,7 +438,7 @@ def enhance_product_description_tool(llm):
             }
 
             # Step 3: LLM generates new content
-            enhanced: ProductDescription = chain.invoke(input_data)
+            enhanced: ProductDescription = await chain.ainvoke(input_data)
             logger.info(f"Generated descriptions: {enhanced.model_dump()}")
 
             # Step 4: Update product in Magento
@@ -371,7 +452,8 @@ def enhance_product_description_tool(llm):
                 }
             }
 
-            response = magento_client.send_request(f"products/{sku}", method="PUT", data=payload)
+            response = await magento_client.asend_request(f"products/{sku}", method="PUT", data=payload)
+            invalidate_product(sku)
 
             return {
                 "message": f"Descriptions updated for SKU '{sku}'",
@@ -386,11 +468,12 @@ def enhance_product_description_tool(llm):
     return Tool.from_function(
         name="enhance_product_description_by_sku",
         description="Enhances or generates product short_description and description based on SKU using LLM.",
-        func=_enhance_description
+        func=None,
+        coroutine=_enhance_description
     )
 
 @tool(args_schema=TopSellingProductsInput)
-def top_selling_products(limit: int = 10, last_n_days: Optional[int] = 7,rank_by: str = "quantity") -> list:
+async def top_selling_products(limit: int = 10, last_n_days: Optional[int] = 7,rank_by: str = "quantity") -> list:
     """
     Fetches top-selling product SKUs from Magento orders within the last N days.
 
@@ -404,64 +487,74 @@ def top_selling_products(limit: int = 10, last_n_days: Optional[int] = 7,rank_by
     """
     try:
         now = datetime.now(timezone.utc)
-        from_date = (now - timedelta(days=last_n_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Encode searchCriteria into query string
-        filters = {
-            "searchCriteria[filterGroups][0][filters][0][field]": "created_at",
-            "searchCriteria[filterGroups][0][filters][0][value]": from_date,
-            "searchCriteria[filterGroups][0][filters][0][conditionType]": "gteq",
-            "searchCriteria[pageSize]": "100"
-        }
-        query_string = urllib.parse.urlencode(filters)
-
-        endpoint = f"orders?{query_string}"
-
-        response = magento_client.send_request(
-            method="GET",
-            endpoint=endpoint
-        )
+        from_date = quote((now - timedelta(days=last_n_days)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+
+        async def fetch_page(page: int) -> dict:
+            async with semaphore:
+                return await magento_client.asend_request(
+                    method="GET",
+                    endpoint=_ORDERS_CREATED_SINCE.format(from_date=from_date, page=page)
+                )
+
+        # Page 1 carries total_count; the remaining pages are fetched concurrently.
+        first_page = await fetch_page(1)
+        num_pages = math.ceil(first_page.get("total_count", 0) / _ORDERS_PAGE_SIZE)
+        if num_pages > _ORDERS_MAX_PAGES:
+            logger.warning(
+                f"top_selling_products: {num_pages} order pages in the last {last_n_days} days; "
+                f"ranking only the first {_ORDERS_MAX_PAGES} ({_ORDERS_MAX_PAGES * _ORDERS_PAGE_SIZE} orders)"
+            )
+            num_pages = _ORDERS_MAX_PAGES
+        pages = [first_page, *await asyncio.gather(*(fetch_page(page) for page in range(2, num_pages + 1)))]
+        items = [order for page in pages for order in page.get("items", [])]
 
-        items = response.get("items", [])
-        product_sales = {}
+        if rank_by == "revenue":
+            # Sum revenue: price * qty
+            revenue_by_sku = defaultdict(float)
+            for order in items:
+                for item in order.get("items", []):
+                    sku = item.get("sku")
+                    if sku:
+                        revenue_by_sku[sku] += item.get("price", 0.0) * item.get("qty_ordered", 0)
+            return [
+                {"sku": sku, "total_revenue": round(revenue, 2)}
+                for sku, revenue in nlargest(limit, revenue_by_sku.items(), key=itemgetter(1))
+            ]
 
+        # Default: sum quantity ordered
+        qty_by_sku = Counter()
         for order in items:
             for item in order.get("items", []):
                 sku = item.get("sku")
-                qty = item.get("qty_ordered", 0)
-                price = item.get("price", 0.0)
-                if not sku:
-                    continue
+                if sku:
+                    qty_by_sku[sku] += item.get("qty_ordered", 0)
+        return [
+            {"sku": sku, "quantity_ordered": qty}
+            for sku, qty in qty_by_sku.most_common(limit)
+        ]
 
-                if rank_by == "revenue":
-                    # Sum revenue: price * qty
-                    product_sales[sku] = product_sales.get(sku, 0.0) + (price * qty)
-                else:
-                    # Default: sum quantity ordered
-                    product_sales[sku] = product_sales.get(sku, 0) + qty
+    except Exception as e:
+        return [{"error": f"Failed to retrieve top-selling products: {str(e)}"}]
 
-        sorted_sales = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)
 
-        if rank_by == "revenue":
-            return [
-                {"sku": sku, "total_revenue": round(revenue, 2)}
-                for sku, revenue in sorted_sales[:limit]
-            ]
-        else:
-            return [
-                {"sku": sku, "quantity_ordered": qty}
-                for sku, qty in sorted_sales[:limit]
-            ]
+@lru_cache(maxsize=1)
+def _load_catalog():
+    """Load the product catalog index once; the related/upsell/crosssell tools all search it."""
+    from langchain_community.vectorstores import FAISS
+    from utils.embedding import get_embeddings
 
-    except Exception as e:
-        return [{"error": f"Failed to retrieve top-selling products: {str(e)}"}]
+    return FAISS.load_local("vectorstores/faiss_catalog", get_embeddings(), allow_dangerous_deserialization=True)
 
 
 def suggest_product_links_tool(llm, relation_type: str) -> Tool:
     assert relation_type in ("upsell", "crosssell","related"), "Invalid relation type"
+    from langgraph.prebuilt.interrupt import HumanInterrupt
+    from langgraph.types import interrupt
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import PromptTemplate
 
-    openai_key = os.getenv("OPENAI_API_KEY")
-    faiss_catalog = FAISS.load_local("vectorstores/faiss_catalog", OpenAIEmbeddings(openai_api_key=openai_key), allow_dangerous_deserialization=True)
+    faiss_catalog = _load_catalog()
     
     parser = JsonOutputParser(pydantic_object=LinkedProductsOutput)
 
@@ -476,7 +569,12 @@ Input SKU: {sku}
 
 Nearby products:
 {similar_products}
-""".strip())
+""".strip()).partial(
+        relation_type=relation_type.replace("sell", "-sell"),  # for prompt clarity
+        format_instructions=parser.get_format_instructions()
+    )
+    # Built once per tool; each call only fills in the SKU and its neighbours.
+    structured_llm_chain = prompt | llm.with_structured_output(LinkedProductsOutput)
 
     def _suggest_and_assign_product_links(sku: str) -> LinkedProductsOutput:        
         link_type = relation_type
@@ -486,16 +584,10 @@ Nearby products:
         similar = [f"{doc.metadata['sku']}: {doc.metadata['name']}" for doc in docs if doc.metadata.get("sku") != sku]
         similar_text = "\n".join(similar)
 
-        input_prompt = prompt.format(
-            sku=sku,
-            relation_type=link_type.replace("sell", "-sell"),  # for prompt clarity
-            similar_products=similar_text,
-            format_instructions=parser.get_format_instructions()
+        result: LinkedProductsOutput = structured_llm_chain.invoke(
+            {"sku": sku, "similar_products": similar_text}
         )
 
-        structured_llm_chain = llm.with_structured_output(LinkedProductsOutput)
-        result: LinkedProductsOutput = structured_llm_chain.invoke(input_prompt)
-
         logger.info(f"Suggested {link_type} SKUs: {result.linked_skus}")
 
         interrupt_config = {
@@ -544,4 +636,4 @@ Nearby products:
     )
 
                
-tools=[top_selling_products,view_product,search_products,update_product,create_product,delete_product_with_hitl]     
\ No newline at end of file
+tools=[top_selling_products,view_product,view_products_bulk,search_products,update_product,create_product,delete_product_with_hitl]     
\ No newline at end of file
@@ -17,7 +17,7 @@ def create_shipment(order_id: int, items: List[ShipmentItem], notify: bool = Tru
     logger.info(f"🚚 Creating shipment for order_id={order_id} with items={items}")
 
     payload = {
-        "items": [item.dict() for item in items],
+        "items": [item.model_dump() for item in items],
         "notify": notify,
         "appendComment": True,
         "comment": {
@@ -4,6 +4,7 @@ from urllib.parse import urlencode
 from langchain_core.tools import tool
 from .schemas import LowStockAlertInput,UpdateStockInput
 from magento.client import get_magento_client
+from magento_tools.product_cache import invalidate_product
 from utils.log import Logger
 
 logger=Logger(name="stock_tools", log_file="Logs/app.log", level=logging.DEBUG)
@@ -23,8 +24,9 @@ def update_stock_qty(sku: str, qty: float, is_in_stock: bool = True):
         # Fetch item ID (required for the stock update endpoint)
         endpoint = f"products/{sku}"
         product = magento_client.send_request(endpoint=endpoint, method="GET")
-        stock_item = product.get("extension_attributes", {}).get("stock_item", {})
-        item_id = stock_item.get("item_id")
+        extension_attributes = product.get("extension_attributes")
+        stock_item = extension_attributes.get("stock_item") if extension_attributes else None
+        item_id = stock_item.get("item_id") if stock_item else None
 
         if not item_id:
             return {"error": f"Could not find stock item for SKU '{sku}'."}
@@ -43,6 +45,7 @@ def update_stock_qty(sku: str, qty: float, is_in_stock: bool = True):
             method="PUT",
             data=payload
         )
+        invalidate_product(sku)
 
         return {
             "result":result,
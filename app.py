@@ -1,26 +1,33 @@
 import asyncio, sys
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+else:
+    # Chainlit starts its own server loop with asyncio.run(), so this policy is what makes it
+    # run on uvloop; do not remove it as redundant with uvicorn's loop selection.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
 import os
-import re
-import json
+import orjson
 import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from langgraph.types import Command
-from langgraph_supervisor import create_supervisor
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from utils.memory import store
-from utils.embedding import initialize_embeddings_and_retriever
+from utils.embedding import get_retriever
 from llm.factory import get_llm_strategy
 from utils.log import Logger
-from supervisors.registry import TEAM_REGISTRY, TeamConfig
+from utils.history import trim_history
+from utils.message_filters import is_valid_ai_message, parse_interrupt
+from magento.magento_oauth_client import start_request_cache
+from magento.client import get_magento_client
+from supervisors.registry import TEAM_REGISTRY
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.messages import convert_to_messages
 from langchain_core.runnables.config import RunnableConfig
-from collections.abc import AsyncGenerator
-from langchain_core.messages import HumanMessage, AIMessageChunk
-from langgraph.graph import START, MessagesState, StateGraph
-from langgraph.types import Command
 import chainlit as cl
 from dotenv import load_dotenv
 
@@ -30,42 +37,40 @@ from dotenv import load_dotenv
 logger = Logger(name="magento_supervisor", log_file="Logs/app.log", level=logging.DEBUG)
 load_dotenv()
 
-def to_serializable(obj):
-    if hasattr(obj, "dict"):
-        return obj.dict()  # for Pydantic
-    elif hasattr(obj, "__dict__"):
+# Streamed content is coalesced and flushed once either bound is reached.
+STREAM_FLUSH_CHARS = 256
+STREAM_FLUSH_SECONDS = 0.05
+STREAM_ERROR_MESSAGE = "\n[Error] Something went wrong during streaming."
+
+# Sync Magento tools run on the loop's default executor when agents call them in parallel;
+# the stock min(32, cpu + 4) workers is easily exhausted by a few concurrent chats.
+TOOL_THREAD_WORKERS = 64
+
+# Process-wide resources, created lazily on the first chat message and reused afterwards.
+_checkpointer = None
+_checkpointer_pool = None
+_supervisor = None
+_supervisor_lock = asyncio.Lock()
+
+def _json_fallback(obj):
+    """orjson ``default`` hook: only called for leaves orjson cannot encode natively."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()  # for Pydantic
+    if hasattr(obj, "__dict__"):
         return obj.__dict__  # for regular classes
-    elif isinstance(obj, (list, tuple)):
-        return [to_serializable(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: to_serializable(v) for k, v in obj.items()}
-    return str(obj)  # fallback for simple types
-
+    return str(obj)
 
-    
-def is_meaningful_response(content: str) -> bool:
-    lower = content.lower()
-    return (
-        "transferring" not in lower and
-        "transferred" not in lower and
-        not lower.startswith("transferring back to") and
-        not lower.startswith("successfully transferred") and
-        not content.startswith("i have successfully") and
-        not content.startswith("if you have any further")
-    )
 
-def is_valid_ai_message(message: AIMessage) -> bool:
-    name = getattr(message, "name", "")
-    if name is None:
-        name = ""
-    return (
-        isinstance(message, AIMessage)
-        and message.content.strip()
-        and is_meaningful_response(message.content)
-        and re.match(r".*_agent$", name)
+@cl.on_app_startup
+async def on_app_startup():
+    # Installed before anything (asyncio.to_thread, sync tools) creates the loop's default
+    # executor; replacing it later would orphan the stock executor and its threads.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=TOOL_THREAD_WORKERS, thread_name_prefix="tool")
     )
-
-
+    # Load the FAISS index once, off the event loop and before any message arrives: lru_cache
+    # does not lock, so concurrent first messages would each read the index from disk.
+    await asyncio.to_thread(get_retriever)
 
 @cl.on_chat_resume
 async def on_chat_resume(thread):
@@ -94,15 +99,61 @@ def load_prompt_text(filepath="top_level_prompt.txt") -> str:
     with open(full_path, "r", encoding="utf-8") as f:
         return f.read()
 
+@lru_cache(maxsize=1)
 def initialize_llm() -> object:
     service_name = os.getenv("LLM_SERVICE", "openai").lower()
     strategy = get_llm_strategy(service_name, "")
     return strategy.initialize()
 
+async def get_checkpointer():
+    """Return the process-wide Postgres checkpointer backed by a shared connection pool."""
+    global _checkpointer, _checkpointer_pool
+    if _checkpointer is None:
+        # Imported on first use: the Postgres saver and psycopg are only needed once a chat starts.
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool
+
+        pool = AsyncConnectionPool(
+            os.getenv("DATABASE_URL"),
+            min_size=4,
+            max_size=20,
+            open=False,
+            # Same connection settings AsyncPostgresSaver.from_conn_string uses.
+            kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        )
+        await pool.open()
+        _checkpointer_pool = pool
+        _checkpointer = AsyncPostgresSaver(pool)
+    return _checkpointer
+
+@cl.on_app_shutdown
+async def on_app_shutdown():
+    """Return the checkpointer's pooled Postgres connections and the Magento HTTP/2 connections
+    on exit or reload."""
+    if _checkpointer_pool is not None:
+        await _checkpointer_pool.close()
+    # Only close a client the tools actually built; calling get_magento_client() here would
+    # construct one just to close it.
+    if get_magento_client.cache_info().currsize:
+        await get_magento_client().aclose()
+
+async def get_supervisor():
+    """Build the LLM, teams and top-level supervisor graph once per process."""
+    global _supervisor
+    async with _supervisor_lock:
+        if _supervisor is None:
+            llm = initialize_llm()
+            teams = build_teams(llm)
+            checkpointer = await get_checkpointer()
+            _supervisor = build_supervisor(llm, teams, checkpointer)
+    return _supervisor
+
 def build_teams(llm) -> dict:
     return {team.name: team.load_team(llm) for team in TEAM_REGISTRY}
 
 def build_supervisor(llm, teams: dict, checkpointer):
+    from langgraph_supervisor import create_supervisor
     from langgraph_supervisor.handoff import create_forward_message_tool
 
     forwarding_tool = create_forward_message_tool("top_level_supervisor")
@@ -112,12 +163,14 @@ def build_supervisor(llm, teams: dict, checkpointer):
         supervisor_name="top_level_supervisor",
         prompt=load_prompt_text(),
         output_mode="full_history",
-        tools=[forwarding_tool] 
+        tools=[forwarding_tool],
+        pre_model_hook=trim_history
     ).compile(checkpointer=checkpointer, store=store, name="top_level_supervisor")
 
-def build_user_messages(user_input: str, retriever) -> list[dict]:
+async def build_user_messages(user_input: str, retriever) -> list[dict]:
     user_input = user_input.content
-    relevant_docs = retriever.invoke(user_input)
+    # The retriever embeds the query over the network; await it instead of blocking the loop.
+    relevant_docs = await retriever.ainvoke(user_input)
     context_text = "\n\n".join(doc.page_content for doc in relevant_docs)
     messages = []
 
@@ -205,18 +258,8 @@ def pretty_print_messages(update, last_message=False):
 
 def extract_interrupt_message(message: dict) -> tuple[str, list[cl.Action]]:
     """Format and return the interruption message and Chainlit actions."""
-    interrupt = message["__interrupt__"][0]
-    logger.info(f"🛑 Workflow interrupted. Awaiting user input: {interrupt.value}")
-
-    if isinstance(interrupt.value, list) and len(interrupt.value) > 0:
-        value = interrupt.value[0]
-    else:
-        value = {}
-
-    action_request = value.get("action_request", {})
-    tool_name = action_request.get("action", "unknown")
-    args = action_request.get("args", {})
-    description = value.get("description", "Action required")
+    raw_value, description, tool_name, args = parse_interrupt(message)
+    logger.info(f"🛑 Workflow interrupted. Awaiting user input: {raw_value}")
     logger.info(f"Interrupt tool: {tool_name}, args: {args}")
 
     actions = [
@@ -232,7 +275,7 @@ async def handle_interrupt_resume(message: dict, original_user_message: cl.Messa
     description, actions, tool_name, args = extract_interrupt_message(message)
 
     user_action = await cl.AskActionMessage(
-        content=f"**Tool:** `{tool_name}`\n\n**Message:** {description}\n\n**Arguments:**\n```json\n{json.dumps(args, indent=2)}\n```",
+        content=f"**Tool:** `{tool_name}`\n\n**Message:** {description}\n\n**Arguments:**\n```json\n{orjson.dumps(args, default=_json_fallback, option=orjson.OPT_INDENT_2).decode()}\n```",
         actions=actions,
         timeout=180
     ).send()
@@ -249,7 +292,7 @@ async def handle_interrupt_resume(message: dict, original_user_message: cl.Messa
     elif value == "edit":
         user_input = await cl.AskUserMessage("✏️ Please provide the updated arguments (JSON):").send()
         try:
-            updated_args = json.loads(user_input.get("content", "{}"))
+            updated_args = orjson.loads(user_input.get("content", "{}"))
         except Exception as e:
             await cl.Message(f"❌ Invalid JSON: {e}").send()
             return None
@@ -266,44 +309,66 @@ async def handle_interrupt_resume(message: dict, original_user_message: cl.Messa
 async def main(message: cl.Message, came_from_resume=None, command=""):
     answer = cl.Message(content="")
 
+    retriever = get_retriever()
+    supervisor = await get_supervisor()
+
     config: RunnableConfig = {
-        "configurable": {"thread_id": cl.context.session.thread_id}
+        "configurable": {"thread_id": cl.context.session.thread_id},
+        "recursion_limit": 50
     }
 
-    embeddings, retriever = initialize_embeddings_and_retriever()
-    llm = initialize_llm()
-    teams = build_teams(llm)
-    db_url = os.getenv("DATABASE_URL")
-
-    async with AsyncPostgresSaver.from_conn_string(db_url) as checkpointer:
-        supervisor = build_supervisor(llm, teams, checkpointer)
-
-        config = {
-            "configurable": {"thread_id": cl.context.session.thread_id},
-            "recursion_limit": 50
-        }
-
-        run_input = command if came_from_resume else {"messages": build_user_messages(message, retriever)}
-
-        async for mode, step in supervisor.astream(
-            run_input,
-            config=config,
-            stream_mode=["messages", "updates"]
-        ):
-            try:
-                current = step[0] if isinstance(step, tuple) else step
-
-                if isinstance(current, dict) and "__interrupt__" in current:
-                    new_command = await handle_interrupt_resume(current, message)
-                    if new_command:
-                        await main(message, came_from_resume=True, command=new_command)
-                    return
-
-                if is_valid_ai_message(current):
-                    logger.info(f"✅ Yielding AI content: {current.content}")
-                    for token in current.content:
-                        await answer.stream_token(token)
-            except Exception as e:
-                logger.error(f"❌ Streaming error: {e}")
-
-        await answer.send()
+    run_input = command if came_from_resume else {"messages": await build_user_messages(message, retriever)}
+
+    # Each message runs in its own task context, so repeated Magento GETs are cached for this turn only.
+    start_request_cache()
+
+    # Bind hot-loop lookups to locals (LOAD_FAST) - the loop runs once per streamed step.
+    _isinstance = isinstance
+    _tuple = tuple
+    _dict = dict
+    _is_valid_ai_message = is_valid_ai_message
+    _stream_token = answer.stream_token
+
+    loop = asyncio.get_running_loop()
+    buffer: list[str] = []
+    buffered_chars = 0
+    last_flush = loop.time()
+    error_reported = False
+    log_tokens = logger.is_enabled_for(logging.DEBUG)
+
+    async for mode, step in supervisor.astream(
+        run_input,
+        config=config,
+        stream_mode=["messages", "updates"]
+    ):
+        try:
+            current = step[0] if _isinstance(step, _tuple) else step
+
+            if _isinstance(current, _dict) and "__interrupt__" in current:
+                if buffer:
+                    await _stream_token("".join(buffer))
+                new_command = await handle_interrupt_resume(current, message)
+                if new_command:
+                    await main(message, came_from_resume=True, command=new_command)
+                return
+
+            if _is_valid_ai_message(current):
+                if log_tokens:
+                    logger.debug(f"✅ Yielding AI content: {current.content}")
+                buffer.append(current.content)
+                buffered_chars += len(current.content)
+                if buffered_chars >= STREAM_FLUSH_CHARS or loop.time() - last_flush > STREAM_FLUSH_SECONDS:
+                    await _stream_token("".join(buffer))
+                    buffer.clear()
+                    buffered_chars = 0
+                    last_flush = loop.time()
+        except Exception as e:
+            # Tracebacks are only formatted when DEBUG output is actually emitted.
+            logger.error(f"❌ Streaming error: {e}", exc_info=logger.is_enabled_for(logging.DEBUG))
+            if not error_reported:
+                buffer.append(STREAM_ERROR_MESSAGE)
+                error_reported = True
+
+    if buffer:
+        await _stream_token("".join(buffer))
+    await answer.send()
@@ -1,8 +1,8 @@
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
-from langchain_core.documents import Document
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-import time
+import math
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -16,33 +16,38 @@ embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
 
 # Product fetching configuration
 page_size = 100
-current_page = 1
-documents = []
+max_concurrent_pages = 8  # bounded so Magento is not overwhelmed
 
-while True:
+
+def fetch_page(current_page: int) -> dict:
     endpoint = f"products?searchCriteria[pageSize]={page_size}&searchCriteria[currentPage]={current_page}"
-    response = magento_client.send_request(endpoint, method="GET")
+    return magento_client.send_request(endpoint, method="GET")
+
 
-    if not response or "items" not in response or len(response["items"]) == 0:
-        print("✅ Finished loading all products.")
-        break
+# Page 1 tells us how many pages there are; the rest are fetched concurrently.
+first_page = fetch_page(1)
+total_count = first_page.get("total_count", 0) if first_page else 0
+num_pages = math.ceil(total_count / page_size)
+print(f"📦 Fetched page 1 of {num_pages} ({total_count} products).")
 
-    for product in response["items"]:
+pages = [first_page]
+if num_pages > 1:
+    with ThreadPoolExecutor(max_workers=max_concurrent_pages) as executor:
+        pages.extend(executor.map(fetch_page, range(2, num_pages + 1)))
+print("✅ Finished loading all products.")
+
+texts = []
+metadatas = []
+for response in pages:
+    for product in (response or {}).get("items", []):
         sku = product.get("sku", "")
         name = product.get("name", "")
         if sku and name:
-            doc = Document(
-                page_content=f"{name} ({sku})",
-                metadata={"sku": sku, "name": name}
-            )
-            documents.append(doc)
-
-    print(f"📦 Fetched page {current_page} with {len(response['items'])} products.")
-    current_page += 1
-    time.sleep(0.2)  # avoid overwhelming Magento server
-
-# Create FAISS vector store
-vectorstore = FAISS.from_documents(documents, embeddings)
+            texts.append(f"{name} ({sku})")
+            metadatas.append({"sku": sku, "name": name})
+
+# Create FAISS vector store (OpenAIEmbeddings already batches the embedding requests)
+vectorstore = FAISS.from_texts(texts, embeddings, metadatas=metadatas)
 
 # Save locally for reuse
 vectorstore.save_local("vectorstores/faiss_catalog")
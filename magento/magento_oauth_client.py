@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import httpx
+import oauthlib.oauth1
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -5,8 +9,9 @@ from urllib.parse import urljoin, urlencode
 from requests_oauthlib import OAuth1
 import os
 import logging
-import json
-from typing import List, Optional, Dict, Any,Union
+import orjson
+from contextvars import ContextVar, Token
+from typing import List, Optional, Dict, Any, Tuple, Union
 
 import logging
 from utils.log import Logger
@@ -16,11 +21,63 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger=Logger(name="magento_oauth_client", log_file="Logs/app.log", level=logging.DEBUG)
 
+class _RequestCache:
+    """GET response bodies for one request scope.
+
+    Writes clear the cache both when they start and when they finish, and a GET is only
+    stored if no write started or finished while it was in flight, so a concurrent read
+    cannot refill the cache with pre-write data.
+    """
+
+    def __init__(self):
+        self._responses: Dict[Tuple[str, Optional[str]], bytes] = {}
+        self._generation = 0
+        self._writes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key) -> Tuple[Optional[bytes], int]:
+        """Return ``(cached body or None, generation)``; pass the generation back to ``store``."""
+        with self._lock:
+            return self._responses.get(key), self._generation
+
+    def store(self, key, content: bytes, generation: int):
+        with self._lock:
+            if generation == self._generation and not self._writes_in_flight:
+                self._responses[key] = content
+
+    def begin_write(self):
+        with self._lock:
+            self._writes_in_flight += 1
+            self._generation += 1
+            self._responses.clear()
+
+    def end_write(self):
+        with self._lock:
+            self._writes_in_flight -= 1
+            self._generation += 1
+            self._responses.clear()
+
+
+# Per-request GET response cache (see start_request_cache); None outside a request scope.
+_request_cache: ContextVar[Optional[_RequestCache]] = ContextVar("magento_request_cache", default=None)
+
+
+def start_request_cache() -> Token:
+    """Start a fresh Magento GET cache for the current context, e.g. one chat turn.
+
+    Identical GETs made by any tool in the same context (including worker threads and tasks
+    spawned from it) are then answered from memory; any POST/PUT/DELETE invalidates the cache.
+    The scope ends with the context, or explicitly via ``_request_cache.reset(token)``.
+    """
+    return _request_cache.set(_RequestCache())
+
 class MagentoOAuthClient:
 
     REST_ENDPOINT_TEMPLATE = "/rest/{store_view_code}/{api_version}/{endpoint}"
     DEFAULT_STORE_VIEW_CODE = "default"
     DEFAULT_API_VERSION = "V1"
+    # Retried with backoff on both transports (idempotent methods only, as urllib3 does).
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
 
     def __init__(
         self,
@@ -31,13 +88,19 @@ class MagentoOAuthClient:
         access_token_secret: Optional[str] = None,
         timeout: int = 30,
         max_retries: int = 3,
-        verify_ssl: bool = False        
+        backoff_factor: float = 0.3,
+        verify_ssl: bool = False,
+        pool_connections: int = 32,
+        pool_maxsize: int = 64
     ):
         
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
         self.verify_ssl = verify_ssl
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
      
         
         # OAuth1 credentials - try parameters first, then environment variables
@@ -53,7 +116,8 @@ class MagentoOAuthClient:
         self._configure_oauth()
         
         # Initialize requests session with OAuth1 and retry strategy
-        self.session = self._create_session()   
+        self.session = self._create_session()
+        self._async_client: Optional[httpx.AsyncClient] = None   
        
     
     def _validate_oauth_credentials(self):
@@ -85,6 +149,13 @@ class MagentoOAuthClient:
                 self.access_token_secret,
                 signature_method='HMAC-SHA256'
             )
+            self.async_oauth = OAuth1Auth(oauthlib.oauth1.Client(
+                self.consumer_key,
+                client_secret=self.consumer_secret,
+                resource_owner_key=self.access_token,
+                resource_owner_secret=self.access_token_secret,
+                signature_method=oauthlib.oauth1.SIGNATURE_HMAC_SHA256
+            ))
             logger.info("OAuth1 authentication configured successfully")
         except Exception as e:
             raise ValueError(f"Failed to configure OAuth1: {str(e)}")   
@@ -97,10 +168,15 @@ class MagentoOAuthClient:
         # Configure retry strategy
         retry_strategy = Retry(
             total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+        )
+        # Keep enough pooled keep-alive connections for agents calling tools in parallel
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry_strategy
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -108,7 +184,8 @@ class MagentoOAuthClient:
         session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
-            'User-Agent': 'Magento-Tool-Generator/1.0'
+            'User-Agent': 'Magento-Tool-Generator/1.0',
+            'Connection': 'keep-alive'
         })
      
         
@@ -133,68 +210,197 @@ class MagentoOAuthClient:
             endpoint=endpoint
         )
     
-    def send_request(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None, 
-                    headers: Optional[Dict] = None, extra_options: Optional[Dict] = None,token=None, store_view_code: Optional[str] = None,
-                     api_version: Optional[str] = None) -> Union[Dict, str]:
-        """Send an HTTP request to the Magento API with OAuth1 authentication."""
-        if extra_options is None:
-            extra_options = {}
-
-        if headers is None:
-            headers = {}
-         
+    def _prepare_request(self, endpoint: str, method: str, data: Optional[Dict], headers: Optional[Dict],
+                         token, store_view_code: Optional[str], api_version: Optional[str]):
+        """Resolve the full URL, headers and JSON body shared by the sync and async transports."""
+        headers = dict(headers) if headers else {}
 
         # Set the Content-Type to application/json if not already set
         headers.setdefault('Content-Type', 'application/json')
         if token:
             headers["Authorization"] = f"Bearer {token}"
         # Convert data to JSON if data is provided and method requires body
-        json_data = None
-        if data and method.upper() in ['POST', 'PUT', 'PATCH', 'DELETE']:
+        method = method.upper()
+        body = None
+        if data and method in ['POST', 'PUT', 'PATCH', 'DELETE']:
             try:
-                json_data =  data  # requests will handle JSON serialization
+                body = orjson.dumps(data)
             except Exception as e:
                 raise ValueError(f"Failed to prepare data for request: {str(e)}")
 
+        formatted_endpoint = self.build_endpoint(endpoint, store_view_code, api_version)
+        full_url = urljoin(self.base_url.rstrip('/') + '/', formatted_endpoint.lstrip('/'))
+        logger.info(full_url)
+        if body is not None and logger.is_enabled_for(logging.DEBUG):
+            logger.debug(f"payload:{data}")
+        return method, full_url, headers, body
+
+    def _handle_response(self, status_code: int, content: bytes, text: Optional[str], http_error: str,
+                         raw: bool) -> Union[Dict, str, bytes]:
+        if text is None:
+            text = content.decode("utf-8", "replace")
+        if status_code >= 400:
+            try:
+                error_body = orjson.loads(content)
+            except Exception:
+                error_body = text
+            logger.error(f"HTTPError: {status_code} — {error_body}")
+            raise ValueError(f"Request failed: {http_error} — Magento says: {error_body}")
+
+        if raw:
+            return content
+
+        try:
+            result = orjson.loads(content)
+            #logger.debug("Parsed JSON Response: %s", result)
+            return result
+        except orjson.JSONDecodeError:
+            logger.warning("Response is not in JSON format. Returning raw text.")
+            return text
+
+    def _retry_delay(self, attempt: int, response: httpx.Response) -> float:
+        """Seconds to wait before retry `attempt` (1-based), following urllib3's Retry: honour a
+        numeric Retry-After, otherwise retry once immediately and then back off exponentially."""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        if attempt <= 1:
+            return 0.0
+        return min(self.backoff_factor * (2 ** (attempt - 1)), Retry.DEFAULT_BACKOFF_MAX)
+
+    def send_request(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None, 
+                    headers: Optional[Dict] = None, extra_options: Optional[Dict] = None,token=None, store_view_code: Optional[str] = None,
+                     api_version: Optional[str] = None, raw: bool = False) -> Union[Dict, str, bytes]:
+        """Send an HTTP request to the Magento API with OAuth1 authentication.
+
+        With ``raw=True`` the undecoded response body is returned, so callers can
+        validate it straight into a Pydantic model with ``model_validate_json``.
+        """
+        method, full_url, headers, body = self._prepare_request(
+            endpoint, method, data, headers, token, store_view_code, api_version
+        )
+        cache = _request_cache.get()
+        cache_key = (full_url, headers.get("Authorization"))
+        if cache is not None and method == "GET":
+            cached, generation = cache.lookup(cache_key)
+            if cached is not None:
+                return self._handle_response(200, cached, None, "", raw)
+        elif cache is not None:
+            cache.begin_write()
         try:
-            formatted_endpoint = self.build_endpoint(endpoint, store_view_code, api_version)
-            full_url = urljoin(self.base_url.rstrip('/') + '/', formatted_endpoint.lstrip('/'))
-            logger.info(full_url)
-            logger.info(f"payload:{json_data}")
-            
             # Make the request with OAuth1 authentication
             response = self.session.request(
-                method=method.upper(),
+                method=method,
                 url=full_url,
-                json=json_data,
+                data=body,
                 headers=headers,
                 timeout=self.timeout,
                 verify=False, #extra_options.get('verify', self.verify_ssl),
                 auth=None if 'Authorization' in headers else self.oauth
             )
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as http_err:
-                try:
-                    error_body = response.json()
-                except Exception:
-                    error_body = response.text
-                logger.error(f"HTTPError: {response.status_code} — {error_body}")
-                raise ValueError(f"Request failed: {http_err} — Magento says: {error_body}")          
-            
-            
-            try:
-                result = response.json()
-                #logger.debug("Parsed JSON Response: %s", result)
-                return result
-            except json.JSONDecodeError:
-                logger.warning("Response is not in JSON format. Returning raw text.")
-                return response.text
-            
+            if cache is not None and method == "GET" and response.status_code < 400:
+                cache.store(cache_key, response.content, generation)
+            http_error = f"{response.status_code} Error: {response.reason} for url: {response.url}"
+            return self._handle_response(response.status_code, response.content, response.text, http_error, raw)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed: {str(e)}")
             raise ValueError(f"Request failed: {str(e)}")
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send request: {str(e)}")
+            raise ValueError(f"Failed to send request: {str(e)}")
+        finally:
+            if cache is not None and method != "GET":
+                cache.end_write()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Shared HTTP/2 client for ``asend_request``, created on first use inside the running loop."""
+        if self._async_client is None:
+            limits = httpx.Limits(
+                max_connections=self.pool_maxsize,
+                max_keepalive_connections=self.pool_connections
+            )
+            self._async_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True, verify=False, limits=limits, retries=self.max_retries
+                ),
+                timeout=self.timeout,
+                # HTTP/2 forbids connection-specific headers such as Connection: keep-alive.
+                headers={
+                    'Accept': 'application/json',
+                    'User-Agent': self.session.headers['User-Agent']
+                }
+            )
+        return self._async_client
+
+    async def aclose(self):
+        """Close the HTTP/2 client and its pooled connections, if ``asend_request`` created one."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    async def asend_request(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None,
+                            headers: Optional[Dict] = None, token=None, store_view_code: Optional[str] = None,
+                            api_version: Optional[str] = None, raw: bool = False) -> Union[Dict, str, bytes]:
+        """Async ``send_request`` over a pooled HTTP/2 httpx client, so concurrent tool calls
+        multiplex on a few connections instead of each holding a worker thread."""
+        method, full_url, headers, body = self._prepare_request(
+            endpoint, method, data, headers, token, store_view_code, api_version
+        )
+        cache = _request_cache.get()
+        cache_key = (full_url, headers.get("Authorization"))
+        if cache is not None and method == "GET":
+            cached, generation = cache.lookup(cache_key)
+            if cached is not None:
+                return self._handle_response(200, cached, None, "", raw)
+        elif cache is not None:
+            cache.begin_write()
+        try:
+            client = self._get_async_client()
+            # The transport only retries failed connections; status retries mirror the sync Retry.
+            retry_statuses = self.RETRY_STATUSES if method in Retry.DEFAULT_ALLOWED_METHODS else ()
+            attempt = 0
+            while True:
+                response = await client.request(
+                    method,
+                    full_url,
+                    content=body,
+                    headers=headers,
+                    auth=None if 'Authorization' in headers else self.async_oauth
+                )
+                if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                    break
+                attempt += 1
+                logger.warning(f"Retrying {method} {full_url} after {response.status_code} (attempt {attempt})")
+                await asyncio.sleep(self._retry_delay(attempt, response))
+            if cache is not None and method == "GET" and response.status_code < 400:
+                cache.store(cache_key, response.content, generation)
+            http_error = f"{response.status_code} Error: {response.reason_phrase} for url: {response.url}"
+            return self._handle_response(response.status_code, response.content, response.text, http_error, raw)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Request failed: {str(e)}")
+            raise ValueError(f"Request failed: {str(e)}")
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Failed to send request: {str(e)}")
-            raise ValueError(f"Failed to send request: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to send request: {str(e)}")
+        finally:
+            if cache is not None and method != "GET":
+                cache.end_write()
+
+
+class OAuth1Auth(httpx.Auth):
+    """httpx auth flow that signs each request with OAuth1 (query and headers; JSON bodies are not signed,
+    matching requests_oauthlib)."""
+
+    def __init__(self, client: oauthlib.oauth1.Client):
+        self.client = client
+
+    def auth_flow(self, request: httpx.Request):
+        _, signed_headers, _ = self.client.sign(str(request.url), http_method=request.method)
+        request.headers["Authorization"] = signed_headers["Authorization"]
+        yield request
@@ -0,0 +1,68 @@
+from functools import lru_cache
+from typing import Any, List, Tuple
+from yarl import URL
+
+# searchCriteria keys, formatted with the filter group index.
+_FILTER_FIELD = "searchCriteria[filterGroups][{group}][filters][0][field]"
+_FILTER_VALUE = "searchCriteria[filterGroups][{group}][filters][0][value]"
+_FILTER_CONDITION = "searchCriteria[filterGroups][{group}][filters][0][condition_type]"
+_SORT_FIELD = "searchCriteria[sortOrders][{index}][field]"
+_SORT_DIRECTION = "searchCriteria[sortOrders][{index}][direction]"
+_PAGE_SIZE = "searchCriteria[pageSize]"
+_CURRENT_PAGE = "searchCriteria[currentPage]"
+
+
+@lru_cache(maxsize=16)
+def _filter_keys(group: int) -> Tuple[str, str, str]:
+    """Return the (field, value, condition_type) keys for a filter group."""
+    return (
+        _FILTER_FIELD.format(group=group),
+        _FILTER_VALUE.format(group=group),
+        _FILTER_CONDITION.format(group=group),
+    )
+
+
+@lru_cache(maxsize=4)
+def _sort_keys(index: int) -> Tuple[str, str]:
+    return _SORT_FIELD.format(index=index), _SORT_DIRECTION.format(index=index)
+
+
+class SearchCriteria:
+    """Builds a Magento ``searchCriteria`` query string.
+
+    Every ``where`` call adds its own filter group, so filters are ANDed together.
+    Values are percent-encoded by yarl's query quoter; pass ``like`` patterns unescaped
+    (``f"%{query}%"``).
+
+    Example:
+        SearchCriteria().where("name", "%bag%", "like").page_size(10).endpoint("products")
+    """
+
+    def __init__(self):
+        self._params: List[Tuple[str, Any]] = []
+        self._groups = 0
+        self._sorts = 0
+
+    def where(self, field: str, value: Any, condition_type: str = "eq") -> "SearchCriteria":
+        field_key, value_key, condition_key = _filter_keys(self._groups)
+        self._params += ((field_key, field), (value_key, value), (condition_key, condition_type))
+        self._groups += 1
+        return self
+
+    def sort(self, field: str, direction: str = "ASC") -> "SearchCriteria":
+        field_key, direction_key = _sort_keys(self._sorts)
+        self._params += ((field_key, field), (direction_key, direction))
+        self._sorts += 1
+        return self
+
+    def page_size(self, size: int) -> "SearchCriteria":
+        self._params.append((_PAGE_SIZE, size))
+        return self
+
+    def current_page(self, page: int) -> "SearchCriteria":
+        self._params.append((_CURRENT_PAGE, page))
+        return self
+
+    def endpoint(self, resource: str) -> str:
+        """Return ``resource?<query>`` ready for ``send_request``."""
+        return str(URL.build(path=resource, query=self._params))
@@ -0,0 +1,46 @@
+import threading
+from typing import Any, Optional
+from cachetools import TTLCache
+
+# Short-lived product cache shared by the agents: the product tools read it, and any tool that
+# changes a product's data or stock (product writes, stock updates, placed orders) invalidates it.
+# Keys are (sku.lower(), store_view_code); Magento SKUs are case-insensitive, so every access
+# goes through _key() and a differently-cased lookup cannot outlive an invalidation.
+# TTLCache is not thread-safe (even get() expires entries) and sync tools invalidate from
+# executor threads, so every operation holds _lock.
+_product_cache = TTLCache(maxsize=1024, ttl=60)
+_lock = threading.Lock()
+# Bumped by every invalidation. Fetchers read it before requesting a product and pass it to
+# put_product, so a response that was in flight across a write is not cached.
+_generation = 0
+
+
+def _key(sku: str, store_view_code: str):
+    return sku.lower(), store_view_code
+
+
+def get_product(sku: str, store_view_code: str) -> Optional[Any]:
+    with _lock:
+        return _product_cache.get(_key(sku, store_view_code))
+
+
+def generation() -> int:
+    with _lock:
+        return _generation
+
+
+def put_product(sku: str, store_view_code: str, product: Any, fetched_at: int) -> None:
+    """Cache `product` unless an invalidation happened since `fetched_at` = generation()."""
+    with _lock:
+        if fetched_at == _generation:
+            _product_cache[_key(sku, store_view_code)] = product
+
+
+def invalidate_product(sku: str) -> None:
+    """Drop every cached store-view entry for `sku` after it is written to Magento."""
+    global _generation
+    sku = sku.lower()
+    with _lock:
+        _generation += 1
+        for key in [key for key in _product_cache if key[0] == sku]:
+            _product_cache.pop(key, None)
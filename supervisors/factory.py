@@ -0,0 +1,24 @@
+from pathlib import Path
+from typing import Any, List
+from langgraph_supervisor import create_supervisor
+from utils.prompts import load_prompt
+from utils.history import trim_history
+
+PROMPT_DIR = Path(__file__).parent
+
+def build_supervisor(name: str, llm, agents: List[Any], forward_messages: bool = True):
+    """Compile the team supervisor `name` over `agents`, using the prompt in `{name}_prompt.md`."""
+    tools = []
+    if forward_messages:
+        from langgraph_supervisor.handoff import create_forward_message_tool
+        tools.append(create_forward_message_tool(name))
+    prompt_text = load_prompt(PROMPT_DIR / f"{name}_prompt.md")
+    return create_supervisor(
+        agents,
+        model=llm,
+        supervisor_name=name,
+        prompt=prompt_text,
+        output_mode="full_history",
+        tools=tools,
+        pre_model_hook=trim_history
+    ).compile(name=name)
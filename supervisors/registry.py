@@ -8,24 +8,24 @@ from agents.invoice.agent import get_invoice_agent
 from agents.shipment.agent import get_shipment_agent
 from agents.directory.agent import get_directory_agent
 
-from supervisors.catalog_supervisor import get_catalog_supervisor
-from supervisors.customer_supervisor import get_customer_supervisor
-from supervisors.sales_supervisor import get_sales_supervisor
-from supervisors.directory_supervisor import get_directory_supervisor
+from agents.base.agent_factory import cache_per_llm
+from supervisors.factory import build_supervisor
 
 class TeamConfig:
-    def __init__(self, name: str, agent_loaders: List[Callable], team_loader: Callable):
+    def __init__(self, name: str, agent_loaders: List[Callable], forward_messages: bool = True):
         self.name = name
         self.agent_loaders = agent_loaders
-        self.team_loader = team_loader
+        self.forward_messages = forward_messages
+        # Compiled once per llm, with the same memo the agent factories use.
+        self.load_team = cache_per_llm(self._build_team)
 
-    def load_team(self, llm):
+    def _build_team(self, llm):
         agents = [loader(llm) for loader in self.agent_loaders]
-        return self.team_loader(llm, agents=agents)
+        return build_supervisor(self.name, llm, agents, forward_messages=self.forward_messages)
 
 TEAM_REGISTRY = [
-    TeamConfig("sales_supervisor", [get_order_agent, get_shipment_agent, get_invoice_agent], get_sales_supervisor),
-    TeamConfig("catalog_supervisor", [get_product_agent, get_category_agent, get_stock_agent], get_catalog_supervisor),
-    TeamConfig("customer_supervisor", [get_customer_agent], get_customer_supervisor),
-    TeamConfig("directory_supervisor", [get_directory_agent], get_directory_supervisor),
+    TeamConfig("sales_supervisor", [get_order_agent, get_shipment_agent, get_invoice_agent]),
+    TeamConfig("catalog_supervisor", [get_product_agent, get_category_agent, get_stock_agent]),
+    TeamConfig("customer_supervisor", [get_customer_agent]),
+    TeamConfig("directory_supervisor", [get_directory_agent], forward_messages=False),
 ]
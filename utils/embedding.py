@@ -1,10 +1,18 @@
 import os
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# langchain_openai and FAISS are imported on first use, so importing this module is cheap
+# and the docs index is only read once something actually retrieves from it.
+
+@lru_cache(maxsize=1)
+def get_embeddings():
+    """Process-wide OpenAI embeddings client, so every vectorstore shares one HTTP connection pool."""
+    from langchain_openai import OpenAIEmbeddings
+    return OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
+
 def initialize_embeddings_and_retriever():
     """
     Initialize OpenAI embeddings and load the FAISS vectorstore retriever.
@@ -13,8 +21,8 @@ def initialize_embeddings_and_retriever():
         embeddings: OpenAIEmbeddings instance
         retriever: FAISS retriever instance
     """
-    openai_key = os.getenv("OPENAI_API_KEY")
-    embeddings = OpenAIEmbeddings(openai_api_key=openai_key)
+    from langchain_community.vectorstores import FAISS
+    embeddings = get_embeddings()
     
     retriever = FAISS.load_local(
         "vectorstores/adobe_docs",
@@ -23,3 +31,9 @@ def initialize_embeddings_and_retriever():
     ).as_retriever(search_type="similarity", k=4)
     
     return embeddings, retriever
+
+@lru_cache(maxsize=1)
+def get_retriever():
+    """Return the docs retriever, loading the index on the first call only."""
+    _, retriever = initialize_embeddings_and_retriever()
+    return retriever
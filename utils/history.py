@@ -0,0 +1,24 @@
+from langchain_core.messages import trim_messages
+
+# Most recent messages sent to the LLM per call; the checkpointed thread keeps the full history.
+MAX_HISTORY_MESSAGES = 40
+
+
+def trim_history(state: dict) -> dict:
+    """``pre_model_hook`` for react agents and supervisors: bound the LLM input to the latest
+    MAX_HISTORY_MESSAGES messages without rewriting the stored conversation.
+
+    The window starts on a human or AI message, never on an orphaned tool result. The leading
+    system message is not pinned: in this app it is the first turn's retrieved docs, and the
+    agent/supervisor prompts are added after this hook runs.
+    """
+    messages = trim_messages(
+        state["messages"],
+        max_tokens=MAX_HISTORY_MESSAGES,
+        token_counter=len,
+        strategy="last",
+        start_on=("human", "ai"),
+        include_system=False,
+        allow_partial=False,
+    )
+    return {"llm_input_messages": messages}
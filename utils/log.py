@@ -1,3 +1,4 @@
+import os
 import logging
 from logging.handlers import RotatingFileHandler
 
@@ -10,8 +11,10 @@ class Logger:
         - name (str): Name for the logger.
         - log_file (str): Path to the log file.
         - level (logging level): Logging level (e.g., logging.DEBUG, logging.INFO).
+          The LOG_LEVEL environment variable (e.g. "INFO"), when set, overrides it.
         """
         try:
+            level = os.getenv("LOG_LEVEL", "").upper() or level
             self.logger = logging.getLogger(name)
             self.logger.setLevel(level)
 
@@ -35,10 +38,15 @@ class Logger:
             self.logger.error("Error initializing logger:{}".format(e))
             raise ValueError("Error initializing logger:{}".format(e))
 
+    def is_enabled_for(self, level):
+        """Returns True if a message of the given level would be emitted."""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, *args,**kwargs):
         """Logs a debug message with multiple arguments."""
         try:
-            self.logger.debug(" ".join(map(str, args)), **kwargs)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(" ".join(map(str, args)), **kwargs)
         except Exception as e:
             self.logger.error("Error logging debug message:{}".format(e))
             raise ValueError("Error logging debug message:{}".format(e))
@@ -46,7 +54,8 @@ class Logger:
     def info(self, *args,**kwargs):
         """Logs an informational message with multiple arguments."""
         try:    
-            self.logger.info(" ".join(map(str, args)), **kwargs)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(" ".join(map(str, args)), **kwargs)
         except Exception as e:
             self.logger.error("Error logging info message:{}".format(e))
             raise ValueError("Error logging info message:{}".format(e))
@@ -54,7 +63,8 @@ class Logger:
     def warning(self, *args,**kwargs):
         """Logs a warning message with multiple arguments."""
         try:    
-            self.logger.warning(" ".join(map(str, args)), **kwargs)
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning(" ".join(map(str, args)), **kwargs)
         except Exception as e:
             self.logger.error("Error logging warning message:{}".format(e))
             raise ValueError("Error logging warning message:{}".format(e))
@@ -67,6 +77,14 @@ class Logger:
             self.logger.error("Error logging error message:{}".format(e))
             raise ValueError("Error logging error message:{}".format(e))
 
+    def exception(self, *args,**kwargs):
+        """Logs an error message with the current exception's traceback; call from an except block."""
+        try:    
+            self.logger.exception(" ".join(map(str, args)), **kwargs)
+        except Exception as e:
+            self.logger.error("Error logging exception message:{}".format(e))
+            raise ValueError("Error logging exception message:{}".format(e))
+
     def critical(self, *args,**kwargs):
         """Logs a critical message with multiple arguments."""
         try:    
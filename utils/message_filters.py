@@ -0,0 +1,52 @@
+"""Pure message predicates used on every streamed step.
+
+Kept free of I/O and framework imports (other than the message type) so the
+module can be compiled with mypyc: ``mypyc utils/message_filters.py``.
+"""
+from typing import Any
+
+from langchain_core.messages import AIMessage
+
+_AGENT_SUFFIX = "_agent"
+
+
+def is_meaningful_response(content: str) -> bool:
+    lower = content.lower()
+    return (
+        "transferring" not in lower and
+        "transferred" not in lower and
+        not lower.startswith("transferring back to") and
+        not lower.startswith("successfully transferred") and
+        not content.startswith("i have successfully") and
+        not content.startswith("if you have any further")
+    )
+
+
+def is_valid_ai_message(message: Any) -> bool:
+    if not isinstance(message, AIMessage):
+        return False
+    name = message.name or ""
+    content = message.content
+    return bool(
+        isinstance(content, str)
+        and content.strip()
+        and is_meaningful_response(content)
+        and name.endswith(_AGENT_SUFFIX)
+    )
+
+
+def parse_interrupt(message: dict) -> tuple[Any, str, str, dict]:
+    """Return ``(raw_value, description, tool_name, args)`` from an ``__interrupt__`` update."""
+    interrupt = message["__interrupt__"][0]
+    raw_value = interrupt.value
+
+    if isinstance(raw_value, list) and len(raw_value) > 0:
+        value = raw_value[0]
+    else:
+        value = {}
+
+    action_request = value.get("action_request", {})
+    tool_name: str = action_request.get("action", "unknown")
+    args: dict = action_request.get("args", {})
+    description: str = value.get("description", "Action required")
+    return raw_value, description, tool_name, args
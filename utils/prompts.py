@@ -1,3 +1,7 @@
-def load_prompt(path: str) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
\ No newline at end of file
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=64)
+def load_prompt(path) -> str:
+    return Path(path).read_text(encoding="utf-8")